@@ -0,0 +1,63 @@
+import resource
+import subprocess
+import sys
+import time
+
+from lks410sdm import Data
+
+documentCount = 20000
+
+template = """
+{
+    "standard": "LKS410 Standard Data Map;;;1.0;;;https://github.com/410-dev/lks410-sdm/tree/main/docs",
+    "DataRoot": {
+        "userName": "user%d",
+        "userName.type": "String",
+        "userId": %d,
+        "userId.type": "Int64",
+        "Scores": [%d, 2, 3],
+        "Scores.type": "List:Int32",
+        "Profile": {
+            "emailAddress": "user%d@company.com",
+            "emailAddress.type": "String",
+            "phoneNumber": "1234-%d",
+            "phoneNumber.type": "String",
+            "active": true,
+            "active.type": "Boolean"
+        },
+        "Profile.type": "Object"
+    },
+    "ExtraProperties": {}
+}
+"""
+
+
+def run(internStrings: bool):
+    documents = []
+    elapsed = 0.0
+    for i in range(documentCount):
+        string = template % (i, i, i, i, i)
+        started = time.perf_counter()
+        d = Data(parseString=string, internStrings=internStrings)
+        elapsed += time.perf_counter() - started
+        d.set("Profile.lastLogin", i)
+        documents.append(d)
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, elapsed)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1] == "intern")
+    else:
+        results = {}
+        for mode in ["plain", "intern"]:
+            output = subprocess.check_output([sys.executable, __file__, mode], text=True)
+            rss, elapsed = output.strip().splitlines()[-1].split()
+            results[mode] = (int(rss), float(elapsed))
+        plainRss, plainTime = results["plain"]
+        internRss, internTime = results["intern"]
+        print(f"Documents: {documentCount}")
+        print(f"Peak RSS without interning: {plainRss / 1024:.1f} MiB, parsing took {plainTime:.2f} s")
+        print(f"Peak RSS with interning:    {internRss / 1024:.1f} MiB, parsing took {internTime:.2f} s")
+        print(f"RSS reduction: {(plainRss - internRss) / 1024:.1f} MiB ({(1 - internRss / plainRss) * 100:.1f}%)")
+        print(f"Parse time increase: {internTime - plainTime:.2f} s ({(internTime / plainTime - 1) * 100:.1f}%)")
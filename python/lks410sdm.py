@@ -1,6 +1,30 @@
 import json
 import importlib
 
+
+class StringInterner:
+    def __init__(self, maxSize: int = 65536):
+        self.maxSize = maxSize
+        self.table = {}
+
+    def intern(self, string):
+        if not isinstance(string, str):
+            return string
+        shared = self.table.get(string)
+        if shared is not None:
+            return shared
+        # Table is bounded: once full, new strings are passed through as-is
+        if len(self.table) < self.maxSize:
+            self.table[string] = string
+        return string
+
+    def clear(self):
+        self.table.clear()
+
+    def __len__(self):
+        return len(self.table)
+
+
 class Data:
 
     class Types:
@@ -44,8 +68,12 @@ class Data:
         ExtraProperties = "ExtraProperties"
         TypeField = "type"
 
-    def __init__(self, parseString: str = None, checkValidity: bool = True, parseFile: str = None):
+    # Shared across all instances created with internStrings=True
+    sharedInterner = StringInterner()
+
+    def __init__(self, parseString: str = None, checkValidity: bool = True, parseFile: str = None, internStrings: bool = False):
         self.checkValidity = checkValidity
+        self.internStrings = internStrings
         self.dictForm = {
             Data.ReservedNames.Standard: Data.Strings.Standard,
             Data.ReservedNames.DataRoot: {},
@@ -60,6 +88,38 @@ class Data:
         elif parseFile is not None:
             self.parseFromFile(parseFile)
 
+    def internString(self, string):
+        if not self.internStrings:
+            return string
+        return Data.sharedInterner.intern(string)
+
+    def internTypeKey(self, key: str, typeKey: str) -> str:
+        # "<key>.type.type" is never interned to keep it out of the shared table
+        if key.endswith(f".{Data.ReservedNames.TypeField}"):
+            return typeKey
+        return self.internString(typeKey)
+
+    def internNode(self, node, isDataRoot: bool = False):
+        # Only DataRoot's own keys, keys declared with a "<key>.type" entry, the ".type" keys and
+        # their values are interned. Other keys, such as IDs used as map keys, are kept as parsed.
+        typeSuffix = f".{Data.ReservedNames.TypeField}"
+        if isinstance(node, list):
+            for i in range(len(node)):
+                node[i] = self.internNode(node[i])
+            return node
+        elif not isinstance(node, dict):
+            return node
+
+        obj = {}
+        for key, value in node.items():
+            if key.endswith(typeSuffix):
+                obj[Data.sharedInterner.intern(key)] = Data.sharedInterner.intern(value)
+            elif isDataRoot or f"{key}{typeSuffix}" in node:
+                obj[Data.sharedInterner.intern(key)] = self.internNode(value)
+            else:
+                obj[key] = self.internNode(value)
+        return obj
+
     def getFast(self, name: str):
         grandparent, parent, key, index = self.traverse(name, create_missing=False, allow_type_modifier=True)
         if parent is None:
@@ -77,10 +137,19 @@ class Data:
         return self.dictForm[Data.ReservedNames.DataRoot]
 
     def set(self, name: str, value, setAs: str = Types.Auto, allowTypeModifier: bool = False) -> bool:
-        grandparent, parent, key, index = self.traverse(name, create_missing=True, allow_type_modifier=allowTypeModifier)
+        # Same rule as internNode: only ".type" keys and keys that get a type entry are interned
+        isTypeKey = name.endswith(f".{Data.ReservedNames.TypeField}")
+        internKey = isTypeKey or setAs != Data.Types.Auto or type(value) not in Data.Types.allInPythonType
+        grandparent, parent, key, index = self.traverse(name, create_missing=True, allow_type_modifier=allowTypeModifier, intern_final_key=internKey)
         if parent is None:
             return False
 
+        if internKey:
+            key = self.internString(key)
+        typeKey = f"{key}.{Data.ReservedNames.TypeField}"
+        if isTypeKey:
+            value = self.internString(value)
+
         if index == -1:
             if type(value) in Data.Types.allInPythonType:
                 parent[key] = value
@@ -102,14 +171,14 @@ class Data:
 
         if setAs == Data.Types.Auto:
             if type(value) not in Data.Types.allInPythonType:
-                if f"{key}.{Data.ReservedNames.TypeField}" in parent and parent[f"{key}.{Data.ReservedNames.TypeField}"] is not None:
-                    setAs = parent[f"{key}.{Data.ReservedNames.TypeField}"]
+                if typeKey in parent and parent[typeKey] is not None:
+                    setAs = parent[typeKey]
                 else:
                     cn = classname(value)
                     setAs = f"{Data.Types.NoStandard}{Data.Types.separator}{Data.Strings.NoStandardObjPython}{cn}"
-                parent[f"{key}.{Data.ReservedNames.TypeField}"] = setAs
+                parent[self.internTypeKey(key, typeKey)] = self.internString(setAs)
         else:
-            parent[f"{key}.{Data.ReservedNames.TypeField}"] = setAs
+            parent[self.internTypeKey(key, typeKey)] = self.internString(setAs)
 
         return True
 
@@ -227,6 +296,11 @@ class Data:
             raise ValueError("Standard header mismatch.")
         if stdStringVersion != Data.Strings.StandardVersion:
             print(f"Warning: Standard version mismatch. Expected {Data.Strings.StandardVersion}, got {stdStringVersion}")
+        if self.internStrings:
+            if stdString == Data.Strings.Standard:
+                jsonData[Data.ReservedNames.Standard] = Data.Strings.Standard
+            if isinstance(jsonData.get(Data.ReservedNames.DataRoot), dict):
+                jsonData[Data.ReservedNames.DataRoot] = self.internNode(jsonData[Data.ReservedNames.DataRoot], isDataRoot=True)
         originalData = self.dictForm.copy()
         self.dictForm = jsonData
         invalidFields: list = self.checkFieldNameValidity()
@@ -277,7 +351,7 @@ class Data:
                 keyNames[i] = keyNames[i][1:]
         return keyNames
 
-    def traverse(self, name: str, create_missing: bool = False, allow_type_modifier: bool = False):
+    def traverse(self, name: str, create_missing: bool = False, allow_type_modifier: bool = False, intern_final_key: bool = False):
         # Disallowed characters:
         disallowed_characters_for_key = ["{", "}", "(", ")", ":"]
         if not allow_type_modifier:
@@ -315,6 +389,8 @@ class Data:
                     if create_missing and (current_node_name not in current_node or len(
                             current_node[current_node_name]) <= list_access_idx):
                         if current_node_name not in current_node:
+                            if intern_final_key:
+                                current_node_name = self.internString(current_node_name)
                             current_node[current_node_name] = []
                         while len(current_node[current_node_name]) <= list_access_idx:
                             current_node[current_node_name].append(None)
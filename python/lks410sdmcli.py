@@ -0,0 +1,313 @@
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from lks410sdm import Data
+
+
+class Commands:
+    Validate = "validate"
+    Normalize = "normalize"
+    TypeData = "typedata"
+    Convert = "convert"
+
+    all = [Validate, Normalize, TypeData, Convert]
+
+
+class Formats:
+    SDM = "sdm"     # LKS410 Standard Data Map
+    JSON = "json"   # Plain JSON object, DataRoot only
+
+    all = [SDM, JSON]
+
+
+def collectFiles(paths: list, pattern: str) -> list:
+    files = []
+    seen = set()
+
+    def add(filePath: str, relativePath: str):
+        # The same file may be given directly and through its directory
+        realPath = os.path.normcase(os.path.realpath(filePath))
+        if realPath not in seen:
+            seen.add(realPath)
+            files.append((filePath, relativePath))
+
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, fileNames in os.walk(path):
+                subdirectories.sort()
+                for fileName in sorted(fileNames):
+                    if fnmatch.fnmatch(fileName, pattern):
+                        filePath = os.path.join(directory, fileName)
+                        add(filePath, os.path.relpath(filePath, path))
+        elif os.path.isfile(path):
+            add(path, os.path.basename(path))
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+    return files
+
+
+def findOutputCollisions(files: list) -> list:
+    outputs = {}
+    collisions = []
+    for filePath, outputPath in files:
+        realPath = os.path.normcase(os.path.realpath(outputPath))
+        if realPath in outputs:
+            collisions.append((outputs[realPath], filePath, outputPath))
+        else:
+            outputs[realPath] = filePath
+    return collisions
+
+
+def writeFile(outputPath: str, content: str):
+    # Written to a temporary file first so an interrupted run never leaves a truncated target
+    directory = os.path.dirname(outputPath)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+    descriptor, temporaryPath = tempfile.mkstemp(dir=directory if directory != "" else ".",
+                                                 prefix=f".{os.path.basename(outputPath)}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w") as file:
+            file.write(content)
+        if os.path.exists(outputPath):
+            shutil.copymode(outputPath, temporaryPath)
+        else:
+            # mkstemp always creates 0600, so new files get the mode open() would have given them
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temporaryPath, 0o666 & ~umask)
+        os.replace(temporaryPath, outputPath)
+    except BaseException:
+        if os.path.exists(temporaryPath):
+            os.remove(temporaryPath)
+        raise
+
+
+def chunked(items: list, chunkSize: int) -> list:
+    return [items[i:i + chunkSize] for i in range(0, len(items), chunkSize)]
+
+
+def stripTypeFields(obj):
+    if isinstance(obj, dict):
+        return {key: stripTypeFields(value) for key, value in obj.items()
+                if key == Data.ReservedNames.TypeField or not key.endswith(f".{Data.ReservedNames.TypeField}")}
+    elif isinstance(obj, list):
+        return [stripTypeFields(item) for item in obj]
+    return obj
+
+
+def processFile(command: str, options: dict, filePath: str) -> tuple:
+    output = None
+    passed = True
+    if command == Commands.Convert and options["source"] == Formats.JSON:
+        with open(filePath, "r") as file:
+            data = Data()
+            data.dictForm[Data.ReservedNames.DataRoot] = json.load(file)
+    elif command == Commands.Validate:
+        with open(filePath, "r") as file:
+            stringData = file.read()
+        try:
+            data = Data(parseString=stringData)
+        except ValueError:
+            # Invalid field names are a validation failure, not an error
+            unchecked = Data()
+            unchecked.dictForm = json.loads(stringData)
+            invalidFields = unchecked.checkFieldNameValidity()
+            if len(invalidFields) == 0:
+                raise
+            print("Field names are not valid: " + ", ".join(invalidFields))
+            return False, None
+    else:
+        data = Data(parseFile=filePath)
+
+    # Type check messages are always collected; they are shown for failed files or with --verbose
+    if command == Commands.Validate:
+        passed = data.typeCheck(strictTypeChecks=options["strict"], strictInSize=options["strictInSize"],
+                                verbose=True, handleNamingConvention=options["naming"],
+                                markTypeEnforcementCompletedOnWritingTypeData=False)
+
+    elif command == Commands.Normalize:
+        data.sortKeysByName()
+        output = data.compileString(linebreak=options["indent"])
+
+    elif command == Commands.TypeData:
+        passed = data.typeCheck(writeTypeData=True, verbose=True, handleNamingConvention=options["naming"])
+        # Failing files are left untouched
+        if passed:
+            data.sortKeysByName()
+            output = data.compileString(linebreak=options["indent"])
+
+    elif command == Commands.Convert:
+        if options["target"] == Formats.JSON:
+            root = data.getRoot()
+            if not options["keepTypes"]:
+                root = stripTypeFields(root)
+            output = json.dumps(root) if options["indent"] < 0 else json.dumps(root, indent=options["indent"])
+        else:
+            output = data.compileString(linebreak=options["indent"])
+
+    return passed, output
+
+
+def processChunk(command: str, options: dict, chunk: list) -> list:
+    results = []
+    for filePath, outputPath in chunk:
+        started = time.perf_counter()
+        messages = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(messages):
+                passed, output = processFile(command, options, filePath)
+            if output is not None and not options["dryRun"]:
+                writeFile(outputPath, output)
+            status = "ok" if passed else "fail"
+        except Exception as e:
+            messages.write(f"{type(e).__name__}: {e}\n")
+            status = "error"
+        results.append((filePath, status, time.perf_counter() - started, messages.getvalue().strip()))
+    return results
+
+
+def outputPathFor(filePath: str, relativePath: str, options: dict) -> str:
+    if options["output"] is None:
+        return filePath
+    outputPath = os.path.join(options["output"], relativePath)
+    if options.get("target") is not None and options["extension"] is not None:
+        outputPath = os.path.splitext(outputPath)[0] + options["extension"]
+    return outputPath
+
+
+def buildParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="lks410sdm", description="Bulk operations on LKS410 Standard Data Map files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("paths", nargs="+", help="Files or directories to process. Directories are walked recursively.")
+    common.add_argument("--pattern", default="*.json", help="File name pattern used when walking directories. (default: *.json)")
+    common.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Number of worker processes. (default: CPU count)")
+    common.add_argument("--chunk-size", type=int, default=16, help="Number of files sent to a worker at once. (default: 16)")
+    common.add_argument("--progress", action="store_true", help="Print progress while processing.")
+    common.add_argument("-q", "--quiet", action="store_true", help="Only print failures and totals.")
+    common.add_argument("--naming", choices=["warning", "error", "none"], default="none", help="How to handle naming convention violations. (default: none)")
+    common.add_argument("-v", "--verbose", action="store_true", help="Print type check warnings.")
+
+    writing = argparse.ArgumentParser(add_help=False)
+    writing.add_argument("-o", "--output", default=None, help="Write results under this directory instead of overwriting inputs.")
+    writing.add_argument("--indent", type=int, default=4, help="Indentation of written files. Negative values write a single line. (default: 4)")
+    writing.add_argument("--dry-run", action="store_true", help="Process files without writing results.")
+
+    validate = subparsers.add_parser(Commands.Validate, parents=[common], help="Validate field names and types.")
+    validate.add_argument("--strict", action="store_true", help="Check declared types against values.")
+    validate.add_argument("--strict-in-size", action="store_true", help="Also compare type sizes, e.g. Int32 and Int64.")
+
+    subparsers.add_parser(Commands.Normalize, parents=[common, writing], help="Sort keys and re-indent.")
+    subparsers.add_parser(Commands.TypeData, parents=[common, writing], help="Write type data for every field.")
+
+    convert = subparsers.add_parser(Commands.Convert, parents=[common, writing], help="Convert between formats.")
+    convert.add_argument("--from", dest="source", choices=Formats.all, default=Formats.SDM, help="Input format. (default: sdm)")
+    convert.add_argument("--to", dest="target", choices=Formats.all, required=True, help="Output format. Requires --output when it differs from --from.")
+    convert.add_argument("--keep-types", action="store_true", help="Keep '.type' fields when converting to plain JSON.")
+    convert.add_argument("--extension", default=None, help="Replace the extension of written files, e.g. '.sdm.json'. Requires --output.")
+
+    return parser
+
+
+def main(argv: list = None) -> int:
+    args = buildParser().parse_args(argv)
+    options = {
+        "strict": getattr(args, "strict", False),
+        "strictInSize": getattr(args, "strict_in_size", False),
+        "naming": args.naming,
+        "verbose": args.verbose,
+        "indent": getattr(args, "indent", 4),
+        "output": getattr(args, "output", None),
+        "dryRun": getattr(args, "dry_run", False),
+        "source": getattr(args, "source", None),
+        "target": getattr(args, "target", None),
+        "keepTypes": getattr(args, "keep_types", False),
+        "extension": getattr(args, "extension", None),
+    }
+    if args.jobs < 1 or args.chunk_size < 1:
+        print("Error: --jobs and --chunk-size must be at least 1.", file=sys.stderr)
+        return 2
+    if args.command == Commands.Convert and options["extension"] is not None and options["output"] is None:
+        print("Error: --extension requires --output.", file=sys.stderr)
+        return 2
+    if args.command == Commands.Convert and options["source"] != options["target"] and options["output"] is None:
+        print("Error: converting between formats requires --output.", file=sys.stderr)
+        return 2
+
+    try:
+        files = collectFiles(args.paths, args.pattern)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    files = [(filePath, outputPathFor(filePath, relativePath, options)) for filePath, relativePath in files]
+    if args.command != Commands.Validate:
+        collisions = findOutputCollisions(files)
+        if len(collisions) > 0:
+            for firstPath, secondPath, outputPath in collisions:
+                print(f"Error: {firstPath} and {secondPath} are both written to {outputPath}.", file=sys.stderr)
+            return 2
+    chunks = chunked(files, args.chunk_size)
+    workers = 1 if args.jobs == 1 or len(chunks) <= 1 else min(args.jobs, len(chunks))
+
+    started = time.perf_counter()
+    done = 0
+    totals = {"ok": 0, "fail": 0, "error": 0}
+    busyTime = 0.0
+    counterShown = False
+
+    def endCounter():
+        # The quiet progress counter is redrawn with "\r" and needs a newline before other output
+        nonlocal counterShown
+        if counterShown:
+            print(file=sys.stderr)
+            counterShown = False
+
+    def report(results: list):
+        nonlocal done, busyTime, counterShown
+        for filePath, status, seconds, messages in results:
+            done += 1
+            totals[status] += 1
+            busyTime += seconds
+            if not args.quiet or status != "ok":
+                endCounter()
+                progress = f"[{done}/{len(files)}] " if args.progress else ""
+                print(f"{progress}{status.upper():5} {seconds * 1000:9.2f} ms  {filePath}")
+                if messages != "" and (args.verbose or status != "ok"):
+                    for line in messages.splitlines():
+                        print(f"      {line}")
+            elif args.progress:
+                print(f"[{done}/{len(files)}]", end="\r", file=sys.stderr)
+                counterShown = True
+
+    if workers == 1:
+        for chunk in chunks:
+            report(processChunk(args.command, options, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(processChunk, args.command, options, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                report(future.result())
+
+    elapsed = time.perf_counter() - started
+    endCounter()
+    print(f"Files: {len(files)}, ok: {totals['ok']}, failed: {totals['fail']}, errors: {totals['error']}")
+    print(f"Wall time: {elapsed:.3f} s, summed file time: {busyTime:.3f} s, workers: {workers}")
+    if len(files) > 0:
+        print(f"Average per file: {busyTime / len(files) * 1000:.2f} ms, throughput: {len(files) / elapsed:.1f} files/s")
+
+    return 0 if totals["fail"] == 0 and totals["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
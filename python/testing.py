@@ -46,3 +46,136 @@ d.sortKeysByName()
 d.append("Val4", "988rugpwefir90jgpjpwdfoigjpsdfo")
 print(d.compileString())
 print(success)
+
+
+def testCommandLine():
+    import contextlib
+    import io
+    import json
+    import os
+    import stat
+    import tempfile
+    from lks410sdmcli import main
+
+    def run(arguments: list) -> int:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return main(arguments)
+
+    with tempfile.TemporaryDirectory() as root:
+        source = os.path.join(root, "source")
+        os.makedirs(os.path.join(source, "nested"))
+        for i in range(6):
+            with open(os.path.join(source, "nested" if i % 2 else "", f"file{i}.json"), "w") as file:
+                file.write(sd)
+
+        assert run(["validate", source, "-j", "2", "--chunk-size", "2"]) == 0
+        assert run(["validate", os.path.join(root, "missing")]) == 2
+        assert run(["convert", source, "--to", "json"]) == 2
+        assert run(["convert", source, "--to", "json", "--extension", ".plain.json"]) == 2
+        assert run(["normalize", source, os.path.join(source, "file0.json"), "-o", os.path.join(root, "same")]) == 0
+        other = os.path.join(root, "other")
+        os.makedirs(other)
+        with open(os.path.join(other, "file0.json"), "w") as file:
+            file.write(sd)
+        assert run(["normalize", source, other, "-o", os.path.join(root, "collide")]) == 2
+        assert not os.path.exists(os.path.join(root, "collide"))
+
+        # Output mirrors the input tree
+        typed = os.path.join(root, "typed")
+        previousUmask = os.umask(0o022)
+        try:
+            assert run(["typedata", source, "-o", typed, "-j", "2", "--chunk-size", "1"]) == 0
+        finally:
+            os.umask(previousUmask)
+        assert sorted(os.listdir(typed)) == ["file0.json", "file2.json", "file4.json", "nested"]
+        assert sorted(os.listdir(os.path.join(typed, "nested"))) == ["file1.json", "file3.json", "file5.json"]
+        assert Data(parseFile=os.path.join(typed, "file0.json")).typeOf("val2") == Data.Types.Integer
+
+        # New files get the mode open() would give them, not mkstemp's 0600
+        assert stat.S_IMODE(os.stat(os.path.join(typed, "nested", "file1.json")).st_mode) == 0o644
+
+        # SDM to JSON to SDM
+        plain = os.path.join(root, "plain")
+        back = os.path.join(root, "back")
+        assert run(["convert", typed, "--to", "json", "-o", plain, "--extension", ".plain.json"]) == 0
+        assert sorted(os.listdir(plain)) == ["file0.plain.json", "file2.plain.json", "file4.plain.json", "nested"]
+        with open(os.path.join(plain, "file0.plain.json")) as file:
+            plainData = json.load(file)
+        assert Data.ReservedNames.Standard not in plainData and "val1.type" not in plainData
+        assert run(["convert", plain, "--from", "json", "--to", "sdm", "-o", back]) == 0
+        original = Data(parseString=sd)
+        converted = Data(parseFile=os.path.join(back, "file0.plain.json"))
+        assert all(converted.getFast(key) == original.getFast(key) for key in ["val1", "val2", "Val4", "Val5", "Val6", "void", "val8"])
+
+        # Type mismatches fail validation, and typedata leaves failing files untouched
+        mismatch = os.path.join(root, "mismatch")
+        os.makedirs(mismatch)
+        with open(os.path.join(mismatch, "file.json"), "w") as file:
+            file.write(sd.replace('"val8": 0.4', '"val8": "text"'))
+        assert run(["validate", mismatch, "--strict"]) == 1
+        with open(os.path.join(mismatch, "naming.json"), "w") as file:
+            file.write(sd.replace('"val9"', '"Val9"'))
+        with open(os.path.join(mismatch, "naming.json")) as file:
+            before = file.read()
+        assert run(["typedata", os.path.join(mismatch, "naming.json"), "--naming", "error"]) == 1
+        with open(os.path.join(mismatch, "naming.json")) as file:
+            assert file.read() == before
+
+        # Invalid field names and broken files fail the run
+        with open(os.path.join(source, "reserved.json"), "w") as file:
+            file.write(sd.replace('"val9"', '"type"'))
+        assert run(["validate", source]) == 1
+        with open(os.path.join(source, "reserved.json"), "w") as file:
+            file.write("{")
+        assert run(["normalize", source, "-o", os.path.join(root, "broken")]) == 1
+
+    print("Command line checks passed")
+
+
+def testInterning():
+    import json
+    from lks410sdm import StringInterner
+
+    Data.sharedInterner.clear()
+    first = Data(parseString=sd, internStrings=True)
+    second = Data(parseString=sd, internStrings=True)
+    assert first.compileString() == Data(parseString=sd).compileString()
+
+    # Keys, ".type" keys, type values and the standard string are shared between instances
+    firstRoot, secondRoot = first.getRoot(), second.getRoot()
+    for key in ["val1", "val1.type", "Val6", "Val6.type", "val9"]:
+        firstKey = next(k for k in firstRoot if k == key)
+        secondKey = next(k for k in secondRoot if k == key)
+        assert firstKey is secondKey
+    assert firstRoot["Val4.type"] is secondRoot["Val4.type"]
+    assert first.dictForm[Data.ReservedNames.Standard] is second.dictForm[Data.ReservedNames.Standard]
+
+    # ExtraProperties keys, untyped nested map keys and untyped keys given to set are left out
+    document = json.loads(sd)
+    document[Data.ReservedNames.DataRoot]["Users"] = {"id1": {"name": "A"}, "id2": {"name": "B"}}
+    document[Data.ReservedNames.ExtraProperties] = {"extraKey": 1}
+    data = Data(parseString=json.dumps(document), internStrings=True)
+    data.set("Users.id3", 3)
+    data.set("Scores[0]", 1)
+    data.set("Typed.count", 1, setAs=Data.Types.Integer64)
+    for key in ["id1", "id2", "id3", "name", "extraKey", "Scores", "Typed"]:
+        assert key not in Data.sharedInterner.table, key
+    for key in ["Users", "count", "count.type", Data.Types.Integer64]:
+        assert key in Data.sharedInterner.table, key
+
+    # The table stops growing at maxSize and clear() empties it
+    interner = StringInterner(maxSize=2)
+    for string in ["a", "b", "c"]:
+        interner.intern(string)
+    assert len(interner) == 2 and "c" not in interner.table
+    interner.clear()
+    assert len(interner) == 0
+    Data.sharedInterner.clear()
+    assert len(Data.sharedInterner) == 0
+
+    print("Interning checks passed")
+
+
+if __name__ == "__main__":
+    testCommandLine()
+    testInterning()